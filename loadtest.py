@@ -0,0 +1,184 @@
+"""
+Load-test scenario for the self-hosted server (server.py).
+
+Fires concurrent requests at one endpoint for a fixed duration and reports
+throughput and latency. Run it against the server started with different
+--workers values to see throughput scale with core count:
+
+    python server.py --workers 1 --threads 16
+    python loadtest.py --endpoint analyze-resume --file resume.pdf --concurrency 32
+
+    python server.py --workers 4 --threads 16
+    python loadtest.py --endpoint analyze-resume --file resume.pdf --concurrency 32
+
+Both endpoints call OpenAI, so the server needs OPENAI_API_KEY set and every
+request is billed.
+"""
+
+import os
+import json
+import time
+import uuid
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+DEFAULT_FORMULA = '=IFERROR(VLOOKUP(A2, Sheet2!A:C, 3, FALSE), "Not found")'
+
+
+# ---------- Request Bodies ----------
+
+def build_formula_request(args):
+    body = json.dumps({"formula": args.formula}).encode("utf-8")
+    return body, "application/json"
+
+
+def build_resume_request(args):
+    boundary = uuid.uuid4().hex
+    parts = []
+
+    if args.file:
+        with open(args.file, "rb") as f:
+            file_data = f.read()
+        filename = os.path.basename(args.file)
+        parts.append(
+            (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n"
+            ).encode("utf-8") + file_data + b"\r\n"
+        )
+    else:
+        with open(args.resume_text, "r", encoding="utf-8") as f:
+            resume_text = f.read()
+        parts.append(
+            (
+                f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="resume_text"\r\n\r\n'
+                f"{resume_text}\r\n"
+            ).encode("utf-8")
+        )
+
+    if args.job_description:
+        with open(args.job_description, "r", encoding="utf-8") as f:
+            job_description = f.read()
+        parts.append(
+            (
+                f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="job_description"\r\n\r\n'
+                f"{job_description}\r\n"
+            ).encode("utf-8")
+        )
+
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+# ---------- Load Generation ----------
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def record(self, status, latency):
+        with self.lock:
+            self.latencies.append(latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def record_error(self):
+        with self.lock:
+            self.errors += 1
+
+
+def run_client(url, body, content_type, deadline, timeout, stats):
+    target = urlsplit(url)
+    headers = {"Content-Type": content_type, "Content-Length": str(len(body))}
+
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+        start = time.monotonic()
+        try:
+            conn.request("POST", target.path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            stats.record(response.status, time.monotonic() - start)
+        except Exception:
+            stats.record_error()
+        finally:
+            conn.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def report(stats, elapsed):
+    latencies = sorted(stats.latencies)
+    completed = len(latencies)
+
+    print(f"Requests:   {completed} in {elapsed:.1f}s ({completed / elapsed:.2f} req/s)")
+    print(f"Errors:     {stats.errors}")
+    print("Statuses:   " + (", ".join(f"{k}: {v}" for k, v in sorted(stats.statuses.items())) or "none"))
+    if latencies:
+        print(
+            "Latency:    "
+            f"p50 {percentile(latencies, 50) * 1000:.0f}ms, "
+            f"p90 {percentile(latencies, 90) * 1000:.0f}ms, "
+            f"p99 {percentile(latencies, 99) * 1000:.0f}ms, "
+            f"max {latencies[-1] * 1000:.0f}ms"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the self-hosted resume analyzer server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL")
+    parser.add_argument("--endpoint", choices=["analyze-resume", "explain-formula"], default="explain-formula")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel client connections")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to keep sending requests")
+    parser.add_argument("--timeout", type=float, default=90.0, help="Per-request timeout in seconds")
+    parser.add_argument("--formula", default=DEFAULT_FORMULA, help="Formula sent to explain-formula")
+    parser.add_argument("--file", help="PDF or DOCX resume sent to analyze-resume")
+    parser.add_argument("--resume-text", help="Plain-text resume file sent to analyze-resume")
+    parser.add_argument("--job-description", help="Job description text file sent to analyze-resume")
+
+    args = parser.parse_args(argv)
+    if args.endpoint == "analyze-resume" and not (args.file or args.resume_text):
+        parser.error("analyze-resume needs --file or --resume-text")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.endpoint == "analyze-resume":
+        body, content_type = build_resume_request(args)
+    else:
+        body, content_type = build_formula_request(args)
+
+    url = args.url.rstrip("/") + "/api/" + args.endpoint
+    print(f"Load testing {url} with {args.concurrency} connections for {args.duration:.0f}s")
+
+    stats = Stats()
+    start = time.monotonic()
+    deadline = start + args.duration
+    clients = [
+        threading.Thread(target=run_client, args=(url, body, content_type, deadline, args.timeout, stats))
+        for _ in range(args.concurrency)
+    ]
+    for t in clients:
+        t.start()
+    for t in clients:
+        t.join()
+
+    report(stats, time.monotonic() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Self-hosted runner for the Vercel Python functions in api/.
+
+Mounts each handler under the same route Vercel gives it and serves them
+from a pre-forked pool of worker processes. Every worker accepts on the
+shared listening socket and handles connections on a bounded thread pool,
+so OpenAI round-trips overlap within a worker while PDF parsing spreads
+across cores.
+
+    python server.py --port 8000 --workers 4 --threads 16
+
+Workers are recycled after --max-requests requests (plus jitter) to cap
+memory growth from PyPDF2. SIGTERM / SIGINT close the listening socket, let
+in-flight requests finish for up to --graceful-timeout seconds, then kill
+whatever is left. Workers that keep crashing on startup are restarted with
+a backoff, and the server gives up after MAX_WORKER_FAILURES in a row.
+Connections that stay silent for --timeout seconds are dropped so they can't
+pin down the worker threads.
+
+The handlers speak HTTP/1.0 and close the connection after every response,
+so keep-alive isn't supported and one connection is one request.
+"""
+
+import os
+import sys
+import random
+import time
+import signal
+import socket
+import argparse
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api")
+
+# Route -> function file, matching Vercel's file-system routing
+MOUNTS = {
+    "/api/analyze-resume": "analyze-resume.py",
+    "/api/explain-formula": "explain-formula.py",
+}
+
+# Consecutive worker crashes before the arbiter gives up
+MAX_WORKER_FAILURES = 5
+# A worker that dies sooner than this after being forked counts as a crash
+WORKER_STARTUP_WINDOW = 5.0
+# Cap on the delay between respawns of a crashing worker, in seconds
+MAX_RESPAWN_DELAY = 5.0
+
+
+# ---------- Routing ----------
+
+def load_handler(filename: str):
+    """Import a file from api/ (hyphenated names aren't importable) and return its handler class."""
+    path = os.path.join(API_DIR, filename)
+    module_name = "api_" + os.path.splitext(filename)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module.handler
+
+
+class RouteHandler(BaseHTTPRequestHandler):
+    """
+    Picks the mounted handler class once the request line is parsed.
+
+    The instance is switched over to that class for the rest of the
+    connection. The handlers use HTTP/1.0 and close after one response, so
+    there is never a second request on it to route.
+    """
+
+    routes = {}
+    # Socket timeout for reads and writes, set from --timeout
+    timeout = 75
+
+    def parse_request(self):
+        if not super().parse_request():
+            return False
+
+        path = urlsplit(self.path).path.rstrip("/")
+        route = self.routes.get(path)
+        if route is None:
+            self.send_error(404, "Not Found")
+            return False
+
+        self.__class__ = route
+        return True
+
+
+def build_routes():
+    routes = {}
+    for path, filename in MOUNTS.items():
+        endpoint = load_handler(filename)
+        routes[path] = type(endpoint.__name__, (RouteHandler, endpoint), {})
+    RouteHandler.routes = routes
+    return routes
+
+
+# ---------- Worker ----------
+
+class WorkerServer(HTTPServer):
+    """
+    HTTPServer that serves a pre-bound socket on a fixed-size thread pool.
+
+    A connection is only accepted once a thread is free for it, so while
+    every thread is busy the remaining connections stay in the shared backlog
+    for other workers to pick up.
+    """
+
+    # How long to wait for a free thread before rechecking for shutdown
+    slot_timeout = 0.5
+
+    def __init__(self, sock, threads: int, max_requests: int):
+        super().__init__(sock.getsockname()[:2], RouteHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        self.max_requests = max_requests
+        self.handled = 0
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="worker")
+        self._stopping = False
+
+    def _handle_request_noblock(self):
+        if not self._slots.acquire(timeout=self.slot_timeout):
+            return
+
+        try:
+            request, client_address = self.get_request()
+        except OSError:
+            # Another worker accepted the connection first
+            self._slots.release()
+            return
+
+        self.process_request(request, client_address)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_thread, request, client_address)
+
+        self.handled += 1
+        if self.max_requests and self.handled >= self.max_requests:
+            self.stop()
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def stop(self):
+        """Leave serve_forever() at the next poll; safe to call from any thread."""
+        if not self._stopping:
+            self._stopping = True
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def server_close(self):
+        # Drop our copy of the listening socket first, so once every process
+        # has let go new clients are refused instead of queuing unanswered
+        self.socket.close()
+        self._pool.shutdown(wait=True)
+
+
+def run_worker(sock, threads: int, max_requests: int):
+    server = WorkerServer(sock, threads, max_requests)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    # Ctrl-C reaches the whole process group; the parent turns it into SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    print(f"[Server] Worker {os.getpid()} started")
+    server.serve_forever()
+    server.server_close()
+    print(f"[Server] Worker {os.getpid()} exiting after {server.handled} requests")
+
+
+# ---------- Arbiter ----------
+
+class Arbiter:
+    """Forks the workers, replaces the ones that exit and coordinates shutdown."""
+
+    def __init__(self, sock, args):
+        self.sock = sock
+        self.args = args
+        self.workers = {}
+        self.stopping = False
+        self.failures = 0
+        self.gave_up = False
+        # Workers waiting to be replaced, and when that may happen
+        self.pending = 0
+        self.respawn_at = 0.0
+
+    def spawn_worker(self):
+        max_requests = self.args.max_requests
+        if max_requests and self.args.max_requests_jitter:
+            # Spread recycling out so the workers don't all restart at once
+            max_requests += random.randint(0, self.args.max_requests_jitter)
+
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return
+
+        status = 0
+        try:
+            random.seed()
+            run_worker(self.sock, self.args.threads, max_requests)
+        except BaseException as e:
+            print(f"[Server] Worker {os.getpid()} crashed:", repr(e))
+            status = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(status)
+
+    def handle_stop(self, signum, frame):
+        if self.stopping:
+            return
+        self.stopping = True
+        self.pending = 0
+        print(f"[Server] Shutting down {len(self.workers)} workers...")
+        self.sock.close()
+        self.signal_workers(signal.SIGTERM)
+        signal.alarm(self.args.graceful_timeout)
+
+    def handle_alarm(self, signum, frame):
+        print("[Server] Graceful timeout reached, killing remaining workers")
+        self.signal_workers(signal.SIGKILL)
+
+    def signal_workers(self, sig):
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+    def handle_exit(self, pid, status):
+        """Schedule a replacement for an exited worker, backing off while workers crash on startup."""
+        started = self.workers.pop(pid, None)
+        if self.stopping:
+            return
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        uptime = time.monotonic() - started if started is not None else 0.0
+        if exit_code != 0:
+            print(f"[Server] Worker {pid} died with exit code {exit_code} after {uptime:.1f}s")
+
+        if uptime >= WORKER_STARTUP_WINDOW:
+            self.failures = 0
+        elif exit_code != 0:
+            self.failures += 1
+            if self.failures >= MAX_WORKER_FAILURES:
+                print(f"[Server] {self.failures} workers crashed in a row, giving up")
+                self.gave_up = True
+                self.handle_stop(None, None)
+                return
+
+        delay = min(0.1 * 2 ** self.failures, MAX_RESPAWN_DELAY) if self.failures else 0.0
+        self.respawn_at = max(self.respawn_at, time.monotonic() + delay)
+        self.pending += 1
+
+    def reap(self):
+        """Wait for a worker to exit, without blocking past a scheduled respawn."""
+        try:
+            if not self.pending:
+                return os.wait()
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            if not self.pending:
+                self.workers.clear()
+            pid, status = 0, 0
+
+        if not pid:
+            time.sleep(min(0.05, max(self.respawn_at - time.monotonic(), 0.0)))
+        return pid, status
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGALRM, self.handle_alarm)
+
+        for _ in range(self.args.workers):
+            self.spawn_worker()
+
+        while self.workers or self.pending:
+            if self.pending and time.monotonic() >= self.respawn_at:
+                while self.pending and not self.stopping:
+                    self.pending -= 1
+                    self.spawn_worker()
+                continue
+
+            pid, status = self.reap()
+            if pid:
+                self.handle_exit(pid, status)
+
+        signal.alarm(0)
+        self.sock.close()
+        print("[Server] Stopped")
+        return 1 if self.gave_up else 0
+
+
+# ---------- Entry Point ----------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the api/ Python functions with a pre-fork worker pool.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_WORKERS", os.cpu_count() or 1)),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("WEB_THREADS", 8)),
+                        help="Request threads per worker")
+    parser.add_argument("--max-requests", type=int, default=int(os.environ.get("WEB_MAX_REQUESTS", 1000)),
+                        help="Recycle a worker after this many requests, i.e. connections (0 disables)")
+    parser.add_argument("--max-requests-jitter", type=int, default=int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 100)),
+                        help="Random extra requests added to each worker's limit")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 60)),
+                        help="Seconds to let in-flight requests finish on shutdown")
+    parser.add_argument("--timeout", type=int, default=int(os.environ.get("WEB_TIMEOUT", 75)),
+                        help="Seconds a connection may sit idle on a read or write before it is dropped")
+    parser.add_argument("--backlog", type=int, default=1024)
+
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.threads < 1:
+        parser.error("--workers and --threads must be at least 1")
+    if args.graceful_timeout < 1 or args.timeout < 1:
+        parser.error("--graceful-timeout and --timeout must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Import once in the parent so workers share the loaded code after fork
+    build_routes()
+    RouteHandler.timeout = args.timeout
+
+    sock = socket.create_server((args.host, args.port), backlog=args.backlog, reuse_port=False)
+    # Every worker polls the same socket; a non-blocking accept lets the ones
+    # that lose the race go back to polling instead of hanging in accept()
+    sock.setblocking(False)
+    print(f"[Server] Listening on http://{args.host}:{args.port} "
+          f"with {args.workers} workers x {args.threads} threads")
+    for path in MOUNTS:
+        print(f"[Server]   {path}")
+    sys.stdout.flush()
+
+    sys.exit(Arbiter(sock, args).run())
+
+
+if __name__ == "__main__":
+    main()
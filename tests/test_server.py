@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+import signal
+import socket
+import argparse
+import threading
+import http.client
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Stands in for the api/ handlers: answers with the worker's pid."""
+
+    def do_GET(self):
+        body = str(os.getpid()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def stub_routes(monkeypatch):
+    mounted = type("StubHandler", (server.RouteHandler, StubHandler), {})
+    monkeypatch.setattr(server.RouteHandler, "routes", {"/api/stub": mounted})
+    monkeypatch.setattr(server.RouteHandler, "timeout", 2)
+    monkeypatch.setattr(server.RouteHandler, "log_message", lambda self, format, *args: None)
+
+
+def listen():
+    sock = socket.create_server(("127.0.0.1", 0))
+    sock.setblocking(False)
+    return sock
+
+
+def get(port, path="/api/stub", timeout=5):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read().decode()
+    finally:
+        conn.close()
+
+
+def make_args(**overrides):
+    args = server.parse_args([])
+    values = dict(vars(args), workers=1, threads=2, max_requests=0, max_requests_jitter=0, graceful_timeout=5)
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+# ---------- Routing ----------
+
+@pytest.fixture
+def worker_port():
+    sock = listen()
+    worker = server.WorkerServer(sock, threads=2, max_requests=0)
+    thread = threading.Thread(target=worker.serve_forever, kwargs={"poll_interval": 0.05})
+    thread.start()
+    try:
+        yield sock.getsockname()[1]
+    finally:
+        worker.shutdown()
+        thread.join()
+        worker.server_close()
+
+
+@pytest.mark.parametrize("path", ["/api/stub", "/api/stub/", "/api/stub?x=1", "/api/stub/?x=1"])
+def test_routes_mounted_path(worker_port, path):
+    status, body = get(worker_port, path)
+    assert status == 200
+    assert body == str(os.getpid())
+
+
+@pytest.mark.parametrize("path", ["/", "/api/other", "/api/stub/extra"])
+def test_unknown_path_is_404(worker_port, path):
+    status, _ = get(worker_port, path)
+    assert status == 404
+
+
+# ---------- Arguments ----------
+
+@pytest.mark.parametrize("flag", ["--workers", "--threads", "--graceful-timeout", "--timeout"])
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_parse_args_rejects_values_below_one(flag, value):
+    with pytest.raises(SystemExit):
+        server.parse_args([flag, value])
+
+
+def test_parse_args_accepts_minimums():
+    args = server.parse_args(["--workers", "1", "--threads", "1", "--graceful-timeout", "1", "--timeout", "1"])
+    assert (args.workers, args.threads, args.graceful_timeout, args.timeout) == (1, 1, 1, 1)
+
+
+# ---------- Crash Backoff ----------
+
+EXIT_1 = 1 << 8
+KILLED = signal.SIGKILL
+
+
+@pytest.fixture
+def arbiter():
+    arbiter = server.Arbiter(socket.socket(), make_args())
+    try:
+        yield arbiter
+    finally:
+        signal.alarm(0)
+        arbiter.sock.close()
+
+
+def test_fast_crashes_back_off_then_give_up(arbiter):
+    for pid in range(1, server.MAX_WORKER_FAILURES):
+        arbiter.workers[pid] = time.monotonic()
+        arbiter.handle_exit(pid, EXIT_1)
+        assert arbiter.failures == pid
+        assert arbiter.respawn_at > time.monotonic()
+        assert not arbiter.stopping
+
+    arbiter.workers[99] = time.monotonic()
+    arbiter.handle_exit(99, EXIT_1)
+    assert arbiter.gave_up
+    assert arbiter.stopping
+    assert arbiter.pending == 0
+
+
+def test_deaths_after_startup_window_reset_failures(arbiter):
+    arbiter.failures = server.MAX_WORKER_FAILURES - 1
+    for pid in range(1, server.MAX_WORKER_FAILURES + 2):
+        arbiter.workers[pid] = time.monotonic() - server.WORKER_STARTUP_WINDOW
+        arbiter.handle_exit(pid, KILLED)
+        assert arbiter.failures == 0
+
+    assert not arbiter.gave_up
+    assert arbiter.pending == server.MAX_WORKER_FAILURES + 1
+    assert arbiter.respawn_at <= time.monotonic()
+
+
+def test_recycled_worker_is_not_a_failure(arbiter):
+    arbiter.workers[1] = time.monotonic()
+    arbiter.handle_exit(1, 0)
+    assert arbiter.failures == 0
+    assert arbiter.pending == 1
+
+
+# ---------- Pre-fork Smoke Tests ----------
+
+def start_arbiter(**overrides):
+    sock = listen()
+    port = sock.getsockname()[1]
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            status = server.Arbiter(sock, make_args(**overrides)).run()
+        finally:
+            os._exit(status)
+
+    sock.close()
+    return pid, port
+
+
+def wait_exit(pid, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.05)
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    pytest.fail("arbiter did not exit")
+
+
+def test_recycles_workers_and_shuts_down_cleanly():
+    pid, port = start_arbiter(max_requests=2)
+    try:
+        workers = [get(port)[1] for _ in range(3)]
+        assert workers[0] == workers[1]
+        assert workers[2] != workers[0]
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        assert wait_exit(pid) == 0
+
+    with pytest.raises(ConnectionRefusedError):
+        get(port)
+
+
+def test_idle_connections_time_out_and_free_their_thread():
+    pid, port = start_arbiter(threads=1)
+    try:
+        idle = socket.create_connection(("127.0.0.1", port))
+        try:
+            time.sleep(0.2)
+            start = time.monotonic()
+            status, _ = get(port, timeout=10)
+            assert status == 200
+            # Served only once the idle connection hit RouteHandler.timeout
+            assert time.monotonic() - start >= 1
+        finally:
+            idle.close()
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        assert wait_exit(pid) == 0